@@ -5,19 +5,40 @@ Generates markdown with embedded images and optional PDF export
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
 import json
 import os
 import re
 import base64
-from typing import Dict, Any, List, Optional
+import textwrap
+from typing import Dict, Any, Deque, Iterator, List, Optional, TextIO, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 import sys
 
+# Image references in update/reply bodies: HTML <img> tags and markdown images
+_IMG_TAG_RE = re.compile(r'<img[^>]*src="([^"]+)"[^>]*>', re.IGNORECASE)
+_MD_IMG_RE = re.compile(r'!\[.*?\]\((https?://[^\)]+)\)', re.IGNORECASE)
+# Monday asset ID embedded in resource URLs
+_ASSET_ID_RE = re.compile(r'/resources/(\d+)/')
+# Attachments with these extensions are embedded as images
+_IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.gif', '.svg')
+# Characters not allowed in filenames, mapped to '_'
+_FN_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
 class MondayExporter:
     """Export Monday.com items to readable formats (Markdown/PDF)"""
     
     API_URL = "https://api.monday.com/v2"
+    MAX_WORKERS = 10  # Concurrent downloads and asset lookups
+    ASSET_BATCH_SIZE = 50  # Asset IDs per public URL query
+    POOL_SIZE = 32  # Pooled HTTP connections per host
     
     def __init__(self, api_token: str):
         self.api_token = api_token
@@ -28,6 +49,18 @@ class MondayExporter:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Keep enough pooled connections for concurrent downloads, and retry
+        # transient gateway errors instead of failing the file
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Public URL per asset ID, None when the lookup found nothing. Public
+        # URLs are pre-signed and expire, so this only lives for one export.
+        self._asset_url_cache: Dict[str, Optional[str]] = {}
     
     def execute_query(self, query: str, variables: Optional[Dict] = None) -> Dict[str, Any]:
         """Execute GraphQL query"""
@@ -122,40 +155,52 @@ class MondayExporter:
     
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem"""
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename[:200].strip()
+        return filename.translate(_FN_TRANS)[:200].strip()
     
-    def download_image(self, url: str, filepath: Path) -> bool:
-        """Download image file"""
+    def download_image(self, url: str, filepath: Path, etags: Optional[Dict[str, str]] = None) -> bool:
+        """Download image file
+        
+        If etags (file name -> ETag from a previous run) is given, an existing
+        file is revalidated with If-None-Match and kept on 304 Not Modified.
+        """
         try:
-            # Handle pre-signed S3 URLs
+            headers = {}
+            # Pre-signed S3 URLs carry their own auth: reuse the pooled
+            # session but don't send the Monday API headers along
             if "s3.amazonaws.com" in url or "X-Amz-Algorithm" in url:
-                response = requests.get(url, timeout=60)
-            else:
-                response = self.session.get(url, timeout=60)
+                headers = {key: None for key in self.headers}
+            
+            etag = etags.get(filepath.name) if etags is not None else None
+            if etag and filepath.exists() and filepath.stat().st_size > 0:
+                headers["If-None-Match"] = etag
+            
+            response = self.session.get(url, headers=headers, timeout=60, stream=True)
             
-            if response.status_code == 200:
-                filepath.parent.mkdir(parents=True, exist_ok=True)
-                filepath.write_bytes(response.content)
-                return True
+            with response:
+                if response.status_code == 304 and "If-None-Match" in headers:
+                    return True
+                
+                if response.status_code == 200:
+                    # Stream to disk in 1 MiB chunks rather than buffering
+                    # the whole file; the caller creates filepath.parent
+                    with open(filepath, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=1 << 20):
+                            if chunk:
+                                f.write(chunk)
+                    
+                    if etags is not None:
+                        if response.headers.get("ETag"):
+                            etags[filepath.name] = response.headers["ETag"]
+                        else:
+                            etags.pop(filepath.name, None)
+                    return True
         except:
             pass
         return False
     
     def extract_images_from_html(self, html: str) -> List[str]:
         """Extract image URLs from HTML content"""
-        urls = []
-        patterns = [
-            r'<img[^>]*src="([^"]+)"[^>]*>',
-            r'!\[.*?\]\((https?://[^\)]+)\)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            urls.extend(matches)
-        
+        urls = _IMG_TAG_RE.findall(html) + _MD_IMG_RE.findall(html)
         return list(set(urls))
     
     def get_asset_public_url(self, asset_id: str) -> Optional[str]:
@@ -178,12 +223,58 @@ class MondayExporter:
             pass
         return None
     
+    def get_asset_public_urls(self, asset_ids: List[str]) -> Dict[str, str]:
+        """Get public URLs for several assets in a single query"""
+        missing = [asset_id for asset_id in asset_ids if asset_id not in self._asset_url_cache]
+        if not missing:
+            return self._cached_asset_urls(asset_ids)
+        
+        query = """
+        query ($assetIds: [ID!]!) {
+            assets(ids: $assetIds) {
+                id
+                public_url
+                url
+            }
+        }
+        """
+        
+        try:
+            result = self.execute_query(query, {"assetIds": missing})
+            urls = {}
+            for asset in result.get("data", {}).get("assets") or []:
+                urls[str(asset.get("id"))] = asset.get("public_url") or asset.get("url")
+            for asset_id in missing:
+                self._asset_url_cache[asset_id] = urls.get(asset_id)
+        except:
+            pass
+        return self._cached_asset_urls(asset_ids)
+    
+    def _cached_asset_urls(self, asset_ids: List[str]) -> Dict[str, str]:
+        """Known public URLs for the given assets"""
+        return {asset_id: self._asset_url_cache[asset_id] for asset_id in asset_ids
+                if self._asset_url_cache.get(asset_id)}
+    
+    def collect_asset_ids(self, item: Dict[str, Any]) -> List[str]:
+        """Collect IDs of assets embedded in update and reply bodies"""
+        asset_ids = set()
+        for update in item.get("updates") or []:
+            bodies = [update.get("body") or ""]
+            bodies.extend(reply.get("body") or "" for reply in update.get("replies") or [])
+            for body in bodies:
+                for img_url in self.extract_images_from_html(body):
+                    asset_match = _ASSET_ID_RE.search(img_url)
+                    if asset_match:
+                        asset_ids.add(asset_match.group(1))
+        return sorted(asset_ids)
+    
     def export_to_markdown(self, item_id: str, output_dir: Path = None) -> Path:
         """Export Monday.com item to a comprehensive markdown file with images"""
         
         # Get item data
         print(f"📋 Fetching item {item_id}...")
         item = self.get_item_complete(item_id)
+        self._asset_url_cache.clear()
         
         # Create output directory based on task name
         task_name = self.sanitize_filename(item.get("name", f"task_{item_id}"))
@@ -198,71 +289,174 @@ class MondayExporter:
         
         print(f"📁 Creating export in: {output_dir}")
         
-        # Start building markdown content
-        md_content = []
+        # ETags of previously downloaded files, so re-runs can skip
+        # transferring attachments that haven't changed
+        cache_file = output_dir / ".cache.json"
+        etags = {}
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding="utf-8"))
+                if isinstance(cached, dict):
+                    etags = cached
+            except (OSError, ValueError):
+                pass
+        
+        # Write markdown file - always named README.md for consistency
+        md_file = output_dir / "README.md"
+        
+        # All network work after the item query (asset lookups, downloads)
+        # shares one pool so every wait overlaps with the others. Lines are
+        # written as soon as every download slot ahead of them has finished.
+        pending = deque()
+        with open(md_file, "w", encoding="utf-8", buffering=1 << 20) as md_fh, \
+                ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for entry in self.build_markdown(item, images_dir, executor, etags):
+                pending.append(entry)
+                self.write_ready_lines(md_fh, pending)
+            self.write_ready_lines(md_fh, pending, wait=True)
+        
+        cache_file.write_text(json.dumps(etags, indent=2), encoding="utf-8")
+        
+        print(f"\n✅ Export complete!")
+        print(f"📄 Markdown file: {md_file}")
+        print(f"🖼️  Images folder: {images_dir}")
+        
+        # Only README.md, images/ and the hidden .cache.json - keep structure minimal
+        
+        return md_file
+    
+    def write_ready_lines(self, md_fh: TextIO, pending: Deque[Any], wait: bool = False):
+        """Write pending lines up to the first download that hasn't finished
+        
+        Download slots are only written if the download succeeded. With
+        wait=True, block on outstanding downloads and drain everything.
+        """
+        while pending:
+            entry = pending[0]
+            if not isinstance(entry, str):
+                future, line, message = entry
+                if not (wait or future.done()):
+                    break
+                if future.result():
+                    print(message)
+                    entry = line
+                else:
+                    entry = None
+            
+            if entry is not None:
+                md_fh.write(entry)
+                md_fh.write("\n")
+            pending.popleft()
+    
+    def build_markdown(self, item: Dict[str, Any], images_dir: Path,
+                       executor: ThreadPoolExecutor,
+                       etags: Optional[Dict[str, str]] = None) -> Iterator[Any]:
+        """Generate markdown lines for an item, submitting downloads to executor
+        
+        Downloads are yielded as (future, markdown, message) slots in place
+        of the line they would produce.
+        """
+        # Resolve public URLs for embedded images in the background, in
+        # batches that run concurrently for comment-heavy items
+        asset_ids = self.collect_asset_ids(item)
+        asset_url_futures = [
+            executor.submit(self.get_asset_public_urls, asset_ids[i:i + self.ASSET_BATCH_SIZE])
+            for i in range(0, len(asset_ids), self.ASSET_BATCH_SIZE)
+        ]
+        
+        # The same file often shows up in several bodies (quoted replies,
+        # re-attached screenshots): download it once and reuse the path
+        downloads: Dict[str, Tuple[Future, Path]] = {}
+        used_paths = set()
+        
+        def queue_download(url: str, file_path: Path, asset_id: Optional[str] = None) -> Tuple[Future, Path]:
+            # Key by asset ID, else by URL; pre-signed S3 URLs without the
+            # signature query, which changes between links to the same file
+            key = asset_id or url
+            if not asset_id and ("s3.amazonaws.com" in url or "X-Amz-Algorithm" in url):
+                key = urlsplit(url)._replace(query="").geturl()
+            if key not in downloads:
+                # A different file with the same name (e.g. two pasted
+                # image.png) must not share a path with a parallel download
+                unique_path = file_path
+                n = 1
+                while unique_path in used_paths:
+                    if asset_id:
+                        tag = asset_id if n == 1 else f"{asset_id}_{n}"
+                    else:
+                        tag = str(n)
+                    unique_path = file_path.with_name(f"{file_path.stem}_{tag}{file_path.suffix}")
+                    n += 1
+                used_paths.add(unique_path)
+                downloads[key] = (executor.submit(self.download_image, url, unique_path, etags), unique_path)
+            return downloads[key]
         
         # Header
-        md_content.append(f"# {item.get('name', 'Untitled Task')}\n")
-        md_content.append(f"*Exported from Monday.com on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n")
-        md_content.append("---\n")
-        
-        # Metadata section
-        md_content.append("## 📌 Task Information\n")
-        md_content.append(f"- **Board:** {item.get('board', {}).get('name')}")
-        md_content.append(f"- **Workspace:** {item.get('board', {}).get('workspace', {}).get('name')}")
-        md_content.append(f"- **Group:** {item.get('group', {}).get('title')}")
-        md_content.append(f"- **Status:** {item.get('state')}")
-        md_content.append(f"- **Created:** {item.get('created_at')}")
-        md_content.append(f"- **Updated:** {item.get('updated_at')}")
-        md_content.append(f"- **Creator:** {item.get('creator', {}).get('name')} ({item.get('creator', {}).get('email')})")
-        md_content.append("\n")
+        yield f"# {item.get('name', 'Untitled Task')}\n"
+        yield f"*Exported from Monday.com on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n"
+        yield "---\n"
+        
+        # Metadata section (nested objects may come back as null)
+        board = item.get("board") or {}
+        creator = item.get("creator") or {}
+        yield "## 📌 Task Information\n"
+        yield f"- **Board:** {board.get('name')}"
+        yield f"- **Workspace:** {(board.get('workspace') or {}).get('name')}"
+        yield f"- **Group:** {(item.get('group') or {}).get('title')}"
+        yield f"- **Status:** {item.get('state')}"
+        yield f"- **Created:** {item.get('created_at')}"
+        yield f"- **Updated:** {item.get('updated_at')}"
+        yield f"- **Creator:** {creator.get('name')} ({creator.get('email')})"
+        yield "\n"
         
         # Column values
         columns = item.get("column_values", [])
         if columns:
-            md_content.append("## 📊 Fields\n")
+            yield "## 📊 Fields\n"
             for col in columns:
                 if col.get("text"):
                     col_type = col.get("type", "text")
                     if col_type == "people":
-                        md_content.append(f"- **Assigned to:** {col.get('text')}")
+                        yield f"- **Assigned to:** {col.get('text')}"
                     elif col_type == "status":
-                        md_content.append(f"- **Status:** {col.get('text')}")
+                        yield f"- **Status:** {col.get('text')}"
                     elif col_type == "date":
-                        md_content.append(f"- **Date:** {col.get('text')}")
+                        yield f"- **Date:** {col.get('text')}"
                     else:
-                        md_content.append(f"- **{col_type.title()}:** {col.get('text')}")
-            md_content.append("\n")
+                        yield f"- **{col_type.title()}:** {col.get('text')}"
+            yield "\n"
         
         # Download and reference direct assets
         assets = item.get("assets", [])
         if assets:
-            md_content.append("## 📎 Attachments\n")
+            yield "## 📎 Attachments\n"
             for i, asset in enumerate(assets):
                 name = asset.get("name", f"attachment_{i}")
                 url = asset.get("public_url") or asset.get("url")
                 
                 if url:
-                    file_path = images_dir / self.sanitize_filename(name)
-                    if self.download_image(url, file_path):
-                        rel_path = f"images/{file_path.name}"
-                        
-                        # Check if it's an image
-                        if any(ext in name.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg']):
-                            md_content.append(f"![{name}]({rel_path})")
-                        else:
-                            md_content.append(f"- [{name}]({rel_path})")
-                        
-                        print(f"  ✓ Downloaded: {name}")
-            md_content.append("\n")
+                    future, file_path = queue_download(url, images_dir / self.sanitize_filename(name), asset.get("id"))
+                    rel_path = f"images/{file_path.name}"
+                    
+                    # Check if it's an image
+                    if name.lower().endswith(_IMAGE_EXTS):
+                        markdown = f"![{name}]({rel_path})"
+                    else:
+                        markdown = f"- [{name}]({rel_path})"
+                    
+                    yield (future, markdown, f"  ✓ Downloaded: {name}")
+            yield "\n"
         
         # Updates/Comments section
         updates = item.get("updates", [])
         if updates:
-            md_content.append("## 💬 Comments & Updates\n")
+            asset_urls = {}
+            for future in asset_url_futures:
+                asset_urls.update(future.result())
+            yield "## 💬 Comments & Updates\n"
             
             for update_idx, update in enumerate(updates):
-                creator = update.get("creator", {}).get("name", "Unknown")
+                creator = (update.get("creator") or {}).get("name", "Unknown")
                 created = update.get("created_at", "")
                 body = update.get("body", "")
                 text_body = update.get("text_body", "")
@@ -270,42 +464,35 @@ class MondayExporter:
                 # Format date
                 if created:
                     try:
-                        dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                        created = dt.strftime("%Y-%m-%d %H:%M")
-                    except:
+                        created = _parse_monday_ts(created).strftime("%Y-%m-%d %H:%M")
+                    except ValueError:
                         pass
                 
-                md_content.append(f"### 💭 {creator} - {created}\n")
+                yield f"### 💭 {creator} - {created}\n"
+                
+                # Add the text content
+                text_body = (text_body or "").strip()
+                if text_body:
+                    yield text_body
                 
                 # Process HTML body for images
-                if body:
-                    # Extract and download images from HTML
-                    img_urls = self.extract_images_from_html(body)
+                img_urls = self.extract_images_from_html(body) if body else []
+                for img_idx, img_url in enumerate(img_urls):
+                    # Try to get asset ID from URL
+                    asset_id = None
+                    asset_match = _ASSET_ID_RE.search(img_url)
+                    if asset_match:
+                        asset_id = asset_match.group(1)
+                        img_url = asset_urls.get(asset_id, img_url)
                     
-                    for img_idx, img_url in enumerate(img_urls):
-                        # Try to get asset ID from URL
-                        asset_match = re.search(r'/resources/(\d+)/', img_url)
-                        if asset_match:
-                            asset_id = asset_match.group(1)
-                            public_url = self.get_asset_public_url(asset_id)
-                            if public_url:
-                                img_url = public_url
-                        
-                        filename = f"comment_{update_idx}_{img_idx}.png"
-                        file_path = images_dir / filename
-                        
-                        if self.download_image(img_url, file_path):
-                            rel_path = f"images/{filename}"
-                            # Replace image in text with markdown image
-                            text_body += f"\n\n![Image]({rel_path})"
-                            print(f"  ✓ Downloaded comment image: {filename}")
+                    future, file_path = queue_download(
+                        img_url, images_dir / f"comment_{update_idx}_{img_idx}.png", asset_id)
+                    # Image follows the comment text
+                    yield (future, f"\n![Image](images/{file_path.name})",
+                                       f"  ✓ Downloaded comment image: {file_path.name}")
                 
-                # Add the text content
-                if text_body:
-                    # Clean up the text
-                    text_body = text_body.strip()
-                    md_content.append(text_body)
-                    md_content.append("\n")
+                if text_body or img_urls:
+                    yield "\n"
                 
                 # Process update assets
                 update_assets = update.get("assets", [])
@@ -315,24 +502,25 @@ class MondayExporter:
                         url = asset.get("public_url") or asset.get("url")
                         
                         if url:
-                            file_path = images_dir / f"update_{update_idx}_{self.sanitize_filename(name)}"
-                            if self.download_image(url, file_path):
-                                rel_path = f"images/{file_path.name}"
-                                
-                                if any(ext in name.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif']):
-                                    md_content.append(f"\n![{name}]({rel_path})\n")
-                                else:
-                                    md_content.append(f"\nAttachment: [{name}]({rel_path})\n")
-                                
-                                print(f"  ✓ Downloaded update attachment: {name}")
+                            future, file_path = queue_download(
+                                url, images_dir / f"update_{update_idx}_{self.sanitize_filename(name)}",
+                                asset.get("id"))
+                            rel_path = f"images/{file_path.name}"
+                            
+                            if name.lower().endswith(_IMAGE_EXTS):
+                                markdown = f"\n![{name}]({rel_path})\n"
+                            else:
+                                markdown = f"\nAttachment: [{name}]({rel_path})\n"
+                            
+                            yield (future, markdown, f"  ✓ Downloaded update attachment: {name}")
                 
                 # Process replies
                 replies = update.get("replies", [])
                 if replies:
-                    md_content.append("\n#### 💬 Replies:\n")
+                    yield "\n#### 💬 Replies:\n"
                     
                     for reply_idx, reply in enumerate(replies):
-                        reply_creator = reply.get("creator", {}).get("name", "Unknown")
+                        reply_creator = (reply.get("creator") or {}).get("name", "Unknown")
                         reply_text = reply.get("text_body", "")
                         reply_body = reply.get("body", "")
                         reply_created = reply.get("created_at", "")
@@ -340,61 +528,41 @@ class MondayExporter:
                         # Format date
                         if reply_created:
                             try:
-                                dt = datetime.fromisoformat(reply_created.replace("Z", "+00:00"))
-                                reply_created = dt.strftime("%Y-%m-%d %H:%M")
-                            except:
+                                reply_created = _parse_monday_ts(reply_created).strftime("%Y-%m-%d %H:%M")
+                            except ValueError:
                                 pass
                         
-                        md_content.append(f"\n**↳ {reply_creator}** - {reply_created}\n")
+                        yield f"\n**↳ {reply_creator}** - {reply_created}\n"
+                        
+                        # Add the reply text content
+                        reply_text = (reply_text or "").strip()
+                        if reply_text:
+                            # Indent reply text (blank lines stay unindented)
+                            yield textwrap.indent(reply_text, "  ", lambda line: bool(line.strip()))
                         
                         # Process HTML body for images in replies
-                        if reply_body:
-                            # Extract and download images from reply HTML
-                            reply_img_urls = self.extract_images_from_html(reply_body)
+                        reply_img_urls = self.extract_images_from_html(reply_body) if reply_body else []
+                        for img_idx, img_url in enumerate(reply_img_urls):
+                            # Try to get asset ID from URL
+                            asset_id = None
+                            asset_match = _ASSET_ID_RE.search(img_url)
+                            if asset_match:
+                                asset_id = asset_match.group(1)
+                                img_url = asset_urls.get(asset_id, img_url)
                             
-                            for img_idx, img_url in enumerate(reply_img_urls):
-                                # Try to get asset ID from URL
-                                asset_match = re.search(r'/resources/(\d+)/', img_url)
-                                if asset_match:
-                                    asset_id = asset_match.group(1)
-                                    public_url = self.get_asset_public_url(asset_id)
-                                    if public_url:
-                                        img_url = public_url
-                                
-                                filename = f"reply_{update_idx}_{reply_idx}_{img_idx}.png"
-                                file_path = images_dir / filename
-                                
-                                if self.download_image(img_url, file_path):
-                                    rel_path = f"images/{filename}"
-                                    # Add image to reply text
-                                    reply_text += f"\n\n![Image]({rel_path})"
-                                    print(f"  ✓ Downloaded reply image: {filename}")
+                            future, file_path = queue_download(
+                                img_url, images_dir / f"reply_{update_idx}_{reply_idx}_{img_idx}.png", asset_id)
+                            # Image follows the (indented) reply text
+                            yield (future, f"  ![Image](images/{file_path.name})",
+                                               f"  ✓ Downloaded reply image: {file_path.name}")
                         
-                        # Add the reply text content
-                        if reply_text:
-                            # Indent reply text
-                            reply_lines = reply_text.strip().split('\n')
-                            for line in reply_lines:
-                                if line.strip():
-                                    md_content.append(f"  {line}")
-                            md_content.append("")
+                        if reply_text or reply_img_urls:
+                            yield ""
                 
-                md_content.append("---\n")
-        
-        # Write markdown file - always named README.md for consistency
-        md_file = output_dir / "README.md"
-        md_file.write_text("\n".join(md_content), encoding="utf-8")
-        
-        print(f"\n✅ Export complete!")
-        print(f"📄 Markdown file: {md_file}")
-        print(f"🖼️  Images folder: {images_dir}")
-        
-        # Don't create metadata file - keep structure minimal
-        
-        return md_file
+                yield "---\n"
     
     def export_to_pdf(self, markdown_file: Path) -> Optional[Path]:
-        """Convert markdown to PDF (requires markdown-pdf or pandoc)"""
+        """Convert markdown to PDF (requires pandoc, weasyprint or wkhtmltopdf)"""
         try:
             import subprocess
             
@@ -416,7 +584,7 @@ class MondayExporter:
                 return pdf_file
                 
             except (subprocess.CalledProcessError, FileNotFoundError):
-                # Try wkhtmltopdf as fallback
+                # Fall back to HTML -> PDF (weasyprint, then wkhtmltopdf)
                 try:
                     # First convert markdown to HTML
                     html_content = f"""
@@ -433,16 +601,29 @@ class MondayExporter:
                     <body>
                     """
                     
-                    # Simple markdown to HTML conversion
-                    md_content = markdown_file.read_text()
-                    # This is very basic - for production use a proper markdown parser
-                    md_content = md_content.replace("# ", "<h1>").replace("\n## ", "</h1>\n<h2>")
-                    md_content = md_content.replace("\n### ", "</h2>\n<h3>").replace("\n", "<br>\n")
+                    # Render markdown to HTML in a single parser pass
+                    from markdown_it import MarkdownIt
+                    md_content = markdown_file.read_text(encoding="utf-8")
+                    html_content += MarkdownIt().render(md_content) + "</body></html>"
+                    
+                    # Render in-process when weasyprint is installed, saving
+                    # a wkhtmltopdf process launch per export. Importing it
+                    # raises OSError when its system libraries are missing.
+                    try:
+                        import weasyprint
+                    except (ImportError, OSError):
+                        weasyprint = None
                     
-                    html_content += md_content + "</body></html>"
+                    if weasyprint is not None:
+                        try:
+                            weasyprint.HTML(string=html_content, base_url=str(markdown_file.parent)).write_pdf(str(pdf_file))
+                            print(f"📑 PDF created: {pdf_file}")
+                            return pdf_file
+                        except Exception:
+                            pass  # Fall through to wkhtmltopdf
                     
                     html_file = markdown_file.with_suffix('.html')
-                    html_file.write_text(html_content)
+                    html_file.write_text(html_content, encoding="utf-8")
                     
                     subprocess.run([
                         "wkhtmltopdf",
@@ -455,8 +636,8 @@ class MondayExporter:
                     return pdf_file
                     
                 except (subprocess.CalledProcessError, FileNotFoundError):
-                    print("⚠️  PDF generation requires pandoc or wkhtmltopdf")
-                    print("   Install with: apt-get install pandoc or apt-get install wkhtmltopdf")
+                    print("⚠️  PDF generation requires pandoc, weasyprint or wkhtmltopdf")
+                    print("   Install with: apt-get install pandoc, pip install weasyprint or apt-get install wkhtmltopdf")
                     
         except ImportError:
             print("⚠️  PDF generation not available")
@@ -464,16 +645,9 @@ class MondayExporter:
         return None
 
 
-def load_env():
-    """Load environment variables from .env file"""
-    env_file = Path(__file__).parent / ".env"
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value.strip()
+def _parse_monday_ts(timestamp: str) -> datetime:
+    """Parse a Monday.com API timestamp (UTC, e.g. 2024-03-12T10:30:00Z)"""
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
 
 
 def parse_monday_url(url: str) -> str:
@@ -492,7 +666,7 @@ def main():
     print("=" * 60)
     
     # Load .env file
-    load_env()
+    load_dotenv(Path(__file__).parent / ".env", override=True)
     
     # Parse arguments
     if len(sys.argv) < 2: